@@ -2,7 +2,7 @@
 
 """The setup script."""
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
 with open('README.rst') as readme_file:
     readme = readme_file.read()
@@ -36,7 +36,12 @@ setup(
     include_package_data=True,
     keywords=['three play', 'threeplay', '3play', '3play api v3'],
     name='three-play',
-    packages=find_packages(include=['three_play', 'three_play.*']),
+    packages=['three_play',
+              'three_play.config',
+              'three_play.utils',
+              'three_play.utils.parse',
+              'three_play.v3',
+              'three_play.v3.models'],
     test_suite='tests',
     tests_require=test_requirements,
     url='https://github.com/rnag/three-play',
@@ -0,0 +1,99 @@
+"""Tests for the SRT parsing utilities in `three-play`."""
+from dataclasses import asdict, fields, replace
+
+import pytest
+
+from three_play.utils.parse import (total_ms, total_seconds, get_srt_duration,
+                                    remove_dialogue_between,
+                                    remove_dialogue_for_first_ts, parse_srt)
+from three_play.utils.parse.models import ListOfSRTLine, SRTLine
+
+
+def test_total_ms():
+    assert total_ms('01:20:32,500') == 4832500
+    assert total_ms('01:20:32.500') == 4832500
+    assert total_ms('01:20:32:500') == 4832500
+    assert total_ms('1:20:32,5') == 4832005
+    assert total_ms('20:32,005') == 1232005
+
+    with pytest.raises(ValueError):
+        total_ms('500')
+    with pytest.raises(ValueError):
+        total_ms('01:20:32;500')
+
+    assert total_seconds('1:20:32,5') == '4832.005'
+
+
+def test_parsed_srt():
+    srt = ('1\n00:00:01,000 --> 00:00:02,000\nhello\n\n'
+           '2\n00:00:02,000 --> 00:00:03,000\nbye\n\n'
+           '3\n00:00:03,000 --> 00:00:04,500\n')
+    parsed = parse_srt(srt)
+
+    assert get_srt_duration(srt) == get_srt_duration(parsed) == 3.0
+
+    expected = srt.replace('bye\n', '')
+    assert remove_dialogue_between(srt, 2000, 3000) == expected
+    assert remove_dialogue_between(parsed, 2000, 3000) == expected
+
+    assert remove_dialogue_for_first_ts(srt, '00:00:02,000') == expected
+    assert remove_dialogue_for_first_ts(parsed, '00:00:02,000') == expected
+
+
+def test_srt_line_dataclass():
+    line = SRTLine('1', '00:00:01,000 --> 00:00:02,000', 'hello there')
+
+    assert [f.name for f in fields(line)] == ['num', 'time_range',
+                                              'dialogue', 'width']
+    assert asdict(line)['dialogue'] == ['hello there']
+    assert replace(line, num=2) == SRTLine(2, line.time_range, line.dialogue)
+
+
+def test_list_of_srt_line():
+    srt = ('1\n00:00:01,000 --> 00:00:02,000\nhello\nthere\n\n'
+           '2\n00:00:02,000 --> 00:00:03,000\n\n'
+           '3\n00:00:03,000 --> 00:00:04,500\nbye')
+
+    lines = ListOfSRTLine(srt)
+    assert [line.num for line in lines] == [1, 2, 3]
+    assert lines[0].dialogue == ['hello', 'there']
+    assert lines[1].dialogue == []
+    assert lines.contents == srt
+
+    # Trailing blank lines are ignored
+    assert ListOfSRTLine(srt + '\n\n\n').contents == srt
+
+    # A block with only one line can't be parsed
+    with pytest.raises(ValueError):
+        ListOfSRTLine(srt + '\n\n4')
+    with pytest.raises(ValueError):
+        SRTLine.parse('4')
+
+    # Line numbers re-assigned as strings are still renumbered on insert
+    lines = ListOfSRTLine(srt)
+    lines[2].num = '3'
+    lines.insert(1, SRTLine(2, '00:00:01,500 --> 00:00:02,000', 'hi'))
+    assert [line.num for line in lines] == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('index', [0, 1, 3, -1, -2])
+def test_extend_at_matches_insert(index):
+    srt = ('1\n00:00:01,000 --> 00:00:02,000\nhello\n\n'
+           'x\n00:00:02,000 --> 00:00:03,000\nthere\n\n'
+           '0\n00:00:03,000 --> 00:00:04,000\n\n'
+           '4\n00:00:04,000 --> 00:00:05,000\nbye')
+
+    def new_lines():
+        return [SRTLine(0, '00:00:00,000 --> 00:00:00,500', 'a'),
+                SRTLine(0, '00:00:00,500 --> 00:00:01,000', 'b')]
+
+    expected = ListOfSRTLine(srt)
+    for i, line in enumerate(new_lines()):
+        # For a negative index, each insert shifts the tail to the right,
+        # so the same index places the next line after the previous one.
+        expected.insert(index if index < 0 else index + i, line)
+
+    actual = ListOfSRTLine(srt)
+    actual.extend_at(index, new_lines())
+
+    assert actual == expected
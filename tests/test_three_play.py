@@ -1,11 +1,18 @@
 #!/usr/bin/env python
 
 """Tests for `three-play` package."""
+import threading
+import time
+
 import pytest
 
-from three_play.errors import InvalidTurnaround
+from three_play.config.requests import DEFAULT_STATUS_FORCE_LIST
+from three_play.errors import InvalidTurnaround, NoSuchMediaFile
+from three_play.utils.cache import ttl_cache
+from three_play.utils.parse import as_int
 from three_play.v3 import *
 from three_play.v3.models import *
+from three_play.v3.models.requests import SessionWithRetry
 
 
 def test_list_media_files(setup_env):
@@ -33,3 +40,216 @@ def test_helper_as_turnaround(setup_env):
     t = ThreePlayHelper.as_turnaround('STANDARD', cls=TurnaroundAD)
     assert type(t) is not Turnaround
     assert t is TurnaroundAD.STANDARD
+
+
+def test_errors():
+    with pytest.raises(InvalidTurnaround) as exc_info:
+        raise InvalidTurnaround('Testing')
+
+    e = exc_info.value
+    assert e.code == 'InvalidTurnaround'
+    assert e.message == str(e) == 'Testing is not a valid turnaround level'
+    assert e.response()['statusCode'] == 400
+
+    e = NoSuchMediaFile('my-video-id')
+    assert e.log_message == ('NoSuchMediaFile: No valid media file exist for '
+                             'the video. video_id=my-video-id')
+
+
+def test_as_int():
+    assert as_int(3) == 3
+    assert as_int('42') == 42
+    assert as_int(True) is True
+    assert as_int('', default=-1) == -1
+    assert as_int(None) == 0
+    assert as_int('abc', raise_=False) == 0
+
+    # Unhashable inputs bypass the cache
+    assert as_int([]) == 0
+    assert as_int({}, default=5) == 5
+
+    with pytest.raises(ValueError):
+        as_int('abc')
+
+
+def test_ttl_cache():
+    calls = []
+
+    @ttl_cache(maxsize=2, ttl=60)
+    def f(a, b=None):
+        calls.append((a, b))
+        return a
+
+    assert f(1) == f(1, None) == f(1, b=None) == 1
+    assert len(calls) == 1
+
+    f(2), f(3)
+    # The least recently used result, for `f(1)`, was evicted
+    f(1)
+    assert len(calls) == 4
+
+    f.cache_invalidate(lambda args: args['a'] == 1)
+    f(1), f(3)
+    assert len(calls) == 5
+
+    f.cache_clear()
+    f(3)
+    assert len(calls) == 6
+
+
+def test_session_with_retry_status_force_list():
+    num_defaults = len(DEFAULT_STATUS_FORCE_LIST)
+
+    for _ in range(3):
+        s = SessionWithRetry(additional_status_force_list=[400])
+        retry = s.get_adapter('https://api.3playmedia.com').max_retries
+        assert retry.status_forcelist == DEFAULT_STATUS_FORCE_LIST + [400]
+
+    assert len(DEFAULT_STATUS_FORCE_LIST) == num_defaults
+
+
+def test_order_bulk():
+    lock = threading.Lock()
+    running = max_running = 0
+
+    def order(video_id):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        if video_id == 'bad':
+            raise ValueError(video_id)
+        return int(video_id), True
+
+    videos = [{'video_id': v} for v in ('1', '2', 'bad', '4', '5', '6')]
+    results = ThreePlayApi._order_bulk(order, videos, 2)
+
+    assert results == [(1, True), (2, True), (None, False),
+                       (4, True), (5, True), (6, True)]
+    assert max_running <= 2
+
+    assert ThreePlayApi._order_bulk(order, [], 2) == []
+
+    # Arguments for a video override the ones shared by all videos
+    def order_with_callback(video_id, callback=None):
+        return int(video_id), callback
+
+    videos = [{'video_id': '1'}, {'video_id': '2', 'callback': 'cb-2'}]
+    results = ThreePlayApi._order_bulk(order_with_callback, videos, 2,
+                                       callback='cb')
+
+    assert results == [(1, 'cb'), (2, 'cb-2')]
+
+
+def fake_pages(monkeypatch, total_entries, per_page=2, fail_pages=()):
+    """
+    Replace `ThreePlayApi._request_page` with one that returns fake pages,
+    where each row is a (page, index) tuple. Returns the list of pages which
+    were requested.
+
+    Note that pages past the last one still return a full page of rows, so
+    that we can check that those pages are dropped.
+    """
+    requested = []
+    lock = threading.Lock()
+
+    def _request_page(method, api, page=None, log_level=None, **kwargs):
+        page = page or 1
+        with lock:
+            requested.append(page)
+        # Complete the later pages first
+        time.sleep(0.002 * (10 - page) if page > 1 else 0)
+        if page in fail_pages:
+            raise ValueError(f'page {page}')
+
+        first = (page - 1) * per_page
+        last = first + per_page
+        if first < total_entries:
+            last = min(last, total_entries)
+        data = [(page, i) for i in range(first, last)]
+        return {'data': data,
+                'pagination': {'per_page': per_page,
+                               'total_entries': total_entries}}
+
+    monkeypatch.setattr(ThreePlayApi, '_request_page', _request_page)
+
+    return requested
+
+
+def test_request_pages_in_order(monkeypatch):
+    requested = fake_pages(monkeypatch, total_entries=9)
+
+    data = ThreePlayApi.get('transcripts')['data']
+
+    assert [i for _, i in data] == list(range(9))
+    assert sorted(requested) == [1, 2, 3, 4, 5]
+
+
+def test_request_single_page(monkeypatch):
+    requested = fake_pages(monkeypatch, total_entries=2)
+
+    data = ThreePlayApi.get('transcripts')['data']
+
+    assert data == [(1, 0), (1, 1)]
+    assert requested == [1]
+
+
+def test_request_max_results(monkeypatch):
+    requested = fake_pages(monkeypatch, total_entries=9)
+
+    data = ThreePlayApi.get('transcripts', max_results=3)['data']
+
+    assert data == [(1, 0), (1, 1), (2, 2)]
+    assert sorted(requested) == [1, 2]
+
+
+def test_request_expected_pages(monkeypatch):
+    requested = fake_pages(monkeypatch, total_entries=5)
+
+    data = ThreePlayApi.get('transcripts', expected_pages=3)['data']
+
+    assert [i for _, i in data] == list(range(5))
+    assert sorted(requested) == [1, 2, 3]
+
+    # More pages are expected than there are; the extra pages are dropped
+    requested.clear()
+    data = ThreePlayApi.get('transcripts', expected_pages=5)['data']
+
+    assert [i for _, i in data] == list(range(5))
+    assert 1 in requested
+
+
+def test_request_row_filter(monkeypatch):
+    requested = fake_pages(monkeypatch, total_entries=9)
+
+    data = ThreePlayApi.get('transcripts', max_results=3,
+                            row_filter=lambda row: row[1] % 2 == 0)['data']
+
+    # The filter is applied to every page, so `max_results` doesn't limit
+    # the pages requested.
+    assert data == [(1, 0), (2, 2), (3, 4)]
+    assert sorted(requested) == [1, 2, 3, 4, 5]
+
+    requested.clear()
+    data = ThreePlayApi.get('transcripts',
+                            row_filter=lambda row: row[1] % 2 == 0)['data']
+
+    assert [i for _, i in data] == [0, 2, 4, 6, 8]
+
+
+def test_request_failed_page_is_dropped(monkeypatch):
+    fake_pages(monkeypatch, total_entries=9, fail_pages=(3,))
+
+    data = ThreePlayApi.get('transcripts')['data']
+
+    assert [i for _, i in data] == [0, 1, 2, 3, 6, 7, 8]
+
+
+def test_request_failed_first_page(monkeypatch):
+    fake_pages(monkeypatch, total_entries=9, fail_pages=(1,))
+
+    with pytest.raises(ValueError):
+        ThreePlayApi.get('transcripts', expected_pages=3)
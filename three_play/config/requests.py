@@ -1,6 +1,7 @@
 """
-Config for retries using the `requests` library
+Config for retries and connection pooling using the `requests` library
 """
+import os
 
 
 # Default timeout for requests
@@ -22,3 +23,8 @@ BACKOFF_MAX = 120
 
 # Set of HTTP status codes that we should force a retry on
 DEFAULT_STATUS_FORCE_LIST = [429, 500, 502, 503, 504]
+
+# Number of connection pools to cache (one per host), and the maximum number
+# of connections to keep alive in each pool.
+DEFAULT_POOL_CONNECTIONS = int(os.getenv('3PLAY_POOL_CONNECTIONS', 10))
+DEFAULT_POOL_MAXSIZE = int(os.getenv('3PLAY_POOL_MAXSIZE', 20))
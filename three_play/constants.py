@@ -5,7 +5,11 @@ Project-specific constants
 __all__ = ['LOG_LEVEL',
            'ERROR_LOG_LEVEL',
            'API_KEY',
-           'INTEGRATION_ID']
+           'INTEGRATION_ID',
+           'DEFAULT_PER_PAGE',
+           'CACHE_TTL',
+           'HELPER_POOL_SIZE',
+           'DEFAULT_BULK_CONCURRENCY']
 
 import os
 
@@ -21,3 +25,16 @@ API_KEY = os.getenv('3PLAY_API_KEY')
 
 # Service Integration ID on 3Play - for example, an integration /w YouTube
 INTEGRATION_ID = os.getenv('INTEGRATION_ID')
+
+# Default number of results to request per page, for paginated API calls
+DEFAULT_PER_PAGE = int(os.getenv('3PLAY_PER_PAGE', 100))
+
+# Seconds to cache results (such as the transcripts for a video) which are
+# looked up by helper methods; this is disabled by default (set to 0).
+CACHE_TTL = float(os.getenv('3PLAY_CACHE_TTL', 0))
+
+# Max number of threads used by helper methods to make API calls in parallel
+HELPER_POOL_SIZE = int(os.getenv('3PLAY_HELPER_POOL_SIZE', 8))
+
+# Default max number of videos to place orders for at a time, for bulk orders
+DEFAULT_BULK_CONCURRENCY = int(os.getenv('3PLAY_BULK_CONCURRENCY', 5))
@@ -9,6 +9,8 @@ __all__ = ['ThreePlayError',
            'NoSuchMediaFile',
            'NoSuchTranscript']
 
+import logging
+
 from .log import LOG
 from .utils.response import format_error
 
@@ -20,19 +22,28 @@ class ThreePlayError(Exception):
     def __init__(self, message, **log_kwargs):
         self.message = message
         self.code = self.__class__.__name__
+        self._log_kwargs = log_kwargs
 
         super(ThreePlayError, self).__init__(self.message)
 
-        if log_kwargs:
-            field_vals = [f'{k}={v}' for k, v in log_kwargs.items()]
+        # Skip formatting the log message entirely if it won't be emitted,
+        # for example when the error is caught and handled by the caller.
+        if LOG.isEnabledFor(logging.ERROR):
+            LOG.error(self.log_message)
+
+    @property
+    def log_message(self) -> str:
+        """The message to log for the error, including any logged fields."""
+        message = self.message
+
+        if self._log_kwargs:
+            field_vals = ', '.join(f'{k}={v}' for k, v in self._log_kwargs.items())
             if message[-1] != '.':
                 message += '.'
 
-            msg = f'{self.code}: {message} {", ".join(field_vals)}'
-        else:
-            msg = f'{self.code}: {self.message}'
+            return f'{self.code}: {message} {field_vals}'
 
-        LOG.error(msg)
+        return f'{self.code}: {message}'
 
     def response(self):
         """Formats an error object and returns an AWS Lambda Proxy response."""
@@ -1,19 +1,57 @@
+import atexit
 import logging
 from logging import getLogger
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from queue import SimpleQueue
 
 from .constants import LOG_LEVEL
 
 
+def enable_async_logging(handler: logging.Handler,
+                         logger: logging.Logger = None) -> QueueListener:
+    """
+    Emit records for `logger` (defaults to the library logger) on a
+    background thread, so that logging calls only need to enqueue a record
+    rather than block on any I/O done by `handler`.
+
+    Returns the :class:`QueueListener` which owns `handler`; it is started
+    here, and stopped (flushing any queued records) at interpreter exit.
+    """
+    q = SimpleQueue()
+
+    listener = QueueListener(q, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    (logger or LOG).addHandler(QueueHandler(q))
+
+    return listener
+
+
 def get_file_logger(filename: str, name=None, level=logging.INFO,
-                    fmt='%(asctime)s - %(levelname)s - %(message)s'):
+                    fmt='%(asctime)s - %(levelname)s - %(message)s',
+                    buffered=True, capacity=1024, use_queue=False):
 
     logger = logging.getLogger(name or __file__)
 
-    handler = logging.FileHandler(filename)
+    # Don't open (or create) the file until the first write
+    handler = logging.FileHandler(filename, delay=True)
     formatter = logging.Formatter(fmt)
     handler.setFormatter(formatter)
 
-    logger.addHandler(handler)
+    if buffered:
+        # Coalesce records into fewer writes; the buffer is flushed when it
+        # has `capacity` records, on a warning or error, or on close.
+        handler = MemoryHandler(capacity, flushLevel=logging.WARNING,
+                                target=handler, flushOnClose=True)
+        atexit.register(handler.close)
+
+    if use_queue:
+        # Write to the file from a background thread instead
+        enable_async_logging(handler, logger)
+    else:
+        logger.addHandler(handler)
+
     logger.setLevel(level)
 
     return logger
@@ -0,0 +1,82 @@
+"""
+Caching utilities
+"""
+__all__ = ['ttl_cache']
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+from inspect import signature
+from typing import Any, Callable, Dict
+
+from .time_util import preferred_clock
+
+
+def ttl_cache(maxsize=1024, ttl: float = 30.0):
+    """
+    Decorator to cache the results of a function for up to `ttl` seconds,
+    keeping at most `maxsize` results (the least recently used are evicted
+    first). If `ttl` is zero or less, results are not cached.
+
+    The cache key is the full set of arguments, with any defaults applied,
+    so calls which only differ by passing a default value explicitly will
+    share the same result.
+
+    The decorated function also has the following methods:
+        - ``cache_clear()`` removes all cached results.
+        - ``cache_invalidate(predicate)`` removes any cached results where
+          `predicate` returns true for the arguments (as a dict of name to
+          value) which the function was called with.
+
+    """
+    def decorator(func):
+        sig = signature(func)
+        # Map of key to (expires_at, arguments, result)
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if ttl <= 0:
+                return func(*args, **kwargs)
+
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.values())
+
+            now = preferred_clock()
+
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(key)
+                    return entry[2]
+
+            # Call the function without holding the lock, so that calls with
+            # other arguments aren't blocked in the meantime.
+            result = func(*args, **kwargs)
+
+            with lock:
+                cache[key] = (now + ttl, bound.arguments, result)
+                cache.move_to_end(key)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+            return result
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        def cache_invalidate(predicate: Callable[[Dict[str, Any]], bool]):
+            with lock:
+                for key in [key for key, (_, arguments, _) in cache.items()
+                            if predicate(arguments)]:
+                    del cache[key]
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_invalidate = cache_invalidate
+
+        return wrapper
+
+    return decorator
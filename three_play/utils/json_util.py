@@ -0,0 +1,24 @@
+"""
+JSON utilities
+"""
+__all__ = ['loads', 'dumps']
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    # Use `orjson` when it's installed, as it's a lot faster at decoding
+    # large responses (such as a page of transcripts).
+    loads = orjson.loads
+
+    def dumps(o) -> str:
+        return orjson.dumps(o).decode()
+
+else:
+    loads = json.loads
+    dumps = json.dumps
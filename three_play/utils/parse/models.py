@@ -1,14 +1,67 @@
-from dataclasses import dataclass, field
-from textwrap import wrap
-from typing import List, Union, Type
+from dataclasses import dataclass
+from textwrap import TextWrapper
+from typing import Dict, Iterable, Iterator, List, Tuple, Type, Union
 
-from ...utils.parse import as_int
 from ..types import R
 
 
 # Default max line width for text wrapping
 DEFAULT_LINE_WIDTH = 35
 
+# Cache of line width to a reusable text wrapper for that width
+_WRAPPERS: Dict[int, TextWrapper] = {}
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    """
+    Wrap `text` into lines of at most `width` characters; this works the same
+    as :func:`textwrap.wrap`, but reuses a :class:`TextWrapper` per width.
+    """
+    # Fast path: short text which `TextWrapper` would return unchanged
+    if len(text) <= width and text.isprintable() and text == text.strip():
+        return [text]
+
+    wrapper = _WRAPPERS.get(width)
+    if wrapper is None:
+        wrapper = _WRAPPERS[width] = TextWrapper(width=width)
+
+    return wrapper.wrap(text)
+
+
+def _as_line_num(num: Union[int, str, None]) -> int:
+    """
+    Coerce a line number to an int, or zero if it can't be parsed.
+    """
+    if type(num) is int:
+        return num
+    try:
+        return int(num) if num else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def _split_block(block: str) -> Tuple[str, str, List[str]]:
+    """
+    Split a (stripped) block from an SRT file into its line number, time
+    range, and lines of dialogue.
+
+    Only the first two line breaks are located with :meth:`str.find`, so
+    that we avoid building an intermediate list for the whole block.
+
+    :raises ValueError: If the block doesn't contain at least two lines
+    """
+    num_end = block.find('\n')
+    if num_end < 0:
+        raise ValueError(f'expected a line number and time range, '
+                         f'got: {block!r}')
+
+    tr_start = num_end + 1
+    tr_end = block.find('\n', tr_start)
+    if tr_end < 0:
+        return block[:num_end], block[tr_start:], []
+
+    return block[:num_end], block[tr_start:tr_end], block[tr_end + 1:].split('\n')
+
 
 # Extend from List[T] so we can get type hinting when looping over,
 # for example
@@ -20,17 +73,38 @@ class ListOfSRTLine(List['SRTLine']):
 
         :param srt_contents: SRT file contents, as a string
         """
-        seq = (SRTLine.parse(lines)
-               for lines in srt_contents.split('\n\n'))
+        super().__init__(self._iter_lines(srt_contents))
+
+    @staticmethod
+    def _iter_lines(srt_contents: str) -> Iterator['SRTLine']:
+        """
+        Yield a :class:`SRTLine` for each block in the SRT file contents.
+
+        This is done in a single pass over the string, by locating the
+        blank line that ends each block with :meth:`str.find`. Any empty
+        blocks (such as from trailing newlines) are skipped.
+        """
+        find = srt_contents.find
+        end = len(srt_contents)
+        pos = 0
+
+        while pos < end:
+            block_end = find('\n\n', pos)
+            if block_end < 0:
+                block_end = end
+
+            block = srt_contents[pos:block_end].strip()
+            if block:
+                yield SRTLine(*_split_block(block))
 
-        super().__init__(seq)
+            pos = block_end + 2
 
     @property
     def contents(self) -> str:
         """
         Return the SRT file contents, as a string
         """
-        return '\n\n'.join(str(lines) for lines in self)
+        return '\n\n'.join(map(str, self))
 
     def insert(self, __index: int, __object: 'SRTLine') -> None:
         """
@@ -38,18 +112,46 @@ class ListOfSRTLine(List['SRTLine']):
         increment the line numbers for all subsequent lines as needed.
 
         """
-        for rem_lines in self[__index:]:
+        self._renumber(__index, 1)
+        super(ListOfSRTLine, self).insert(__index, __object)
+
+    def extend_at(self, index: int, lines: Iterable['SRTLine']) -> None:
+        """
+        Insert multiple :class:`SRTLine` objects into the list at a specified
+        index, and increment the line numbers for all subsequent lines as
+        needed.
+
+        This is the same as calling :meth:`insert` for each line in turn,
+        but only renumbers the subsequent lines once.
+
+        """
+        lines = list(lines)
+        self._renumber(index, len(lines))
+        self[index:index] = lines
+
+    def _renumber(self, index: int, delta: int) -> None:
+        """
+        Increment the line numbers for all lines from `index` onwards by
+        `delta`.
+        """
+        # Resolve a negative index the same way `list.insert` does, so the
+        # fallback line number below is based on the actual position.
+        if index < 0:
+            index = max(len(self) + index, 0)
+
+        for rem_lines in self[index:]:
             # Added because type hints don't automatically work here, for some reason
             rem_lines: SRTLine
-            if not rem_lines.num:
+            # `num` is a plain attribute, so it might have been re-assigned
+            # to a string since the line was created.
+            num = _as_line_num(rem_lines.num)
+            if not num:
                 # Line number cannot be parsed to int
-                rem_lines.num = __index + 1
-            rem_lines.num += 1
-
-        super(ListOfSRTLine, self).insert(__index, __object)
+                num = index + 1
+            rem_lines.num = num + delta
 
 
-@dataclass(init=False)
+@dataclass(init=False, repr=False, eq=False)
 class SRTLine:
     """
     Represents a sequence of dialogue lines in an SRT file.
@@ -65,7 +167,9 @@ class SRTLine:
         * the remaining lines (can be empty) will be the dialogue
 
     """
-    # The line number (as a string)
+    __slots__ = ('num', 'time_range', 'dialogue', 'width')
+
+    # The line number
     num: int
 
     # The time range where the line should appear in the video
@@ -75,15 +179,25 @@ class SRTLine:
     dialogue: List[str]
 
     # The line width to wrap when `dialogue` is passed as a string
-    width: int = field(repr=False)
+    width: int
 
     def __init__(self, num: Union[int, str] = 0, time_range: str = '',
                  dialogue: Union[List[str], str, None] = None,
                  width: int = DEFAULT_LINE_WIDTH):
-        self.num = num
+        # Fast path: a list of lines, which is what `parse` passes in.
+        # Only wrap the dialogue when a (non-empty) string is passed in.
+        if type(dialogue) is not list:
+            if not dialogue:
+                dialogue = []
+            elif isinstance(dialogue, str):
+                dialogue = _wrap(dialogue, width)
+            else:
+                dialogue = list(dialogue)
+
+        self.num = _as_line_num(num)
         self.time_range = time_range
-        self.width = width
         self.dialogue = dialogue
+        self.width = width
 
     @classmethod
     def parse(cls: Type[R], lines: Union[str, List[str]]) -> R:
@@ -94,9 +208,8 @@ class SRTLine:
             to the sequence as specified in the class docs.
 
         """
-        # Convert to a list if needed
         if isinstance(lines, str):
-            lines = lines.strip().split('\n')
+            return cls(*_split_block(lines.strip()))
         # Unpack the list, save the remaining lines into `dialogue`
         line_num, time_range, *dialogue = lines
         # Returns the new object
@@ -117,27 +230,6 @@ class SRTLine:
         """Returns the dialogue as a string."""
         return ' '.join(line.strip() for line in self.dialogue)
 
-    @property
-    def num(self) -> int:
-        return self._num
-
-    @num.setter
-    def num(self, n: Union[str, int], default=0):
-        """Set the :attr:`num` attribute."""
-        self._num = as_int(n, default, raise_=False)
-
-    @property
-    def dialogue(self) -> List[str]:
-        return self._dialogue
-
-    @dialogue.setter
-    def dialogue(self, lines: Union[List[str], str, None]):
-        """Set the dialogue for the line."""
-        dialogue = lines or []
-        if not isinstance(dialogue, list):
-            dialogue = wrap(dialogue, width=self.width)
-        self._dialogue = dialogue
-
     def set_time_range_if_empty(self, time_range: str):
         """Set the :attr:`time_range` attribute if it's empty or null."""
         if not self.time_range:
@@ -148,4 +240,18 @@ class SRTLine:
         Returns the string representation of the line, as it would
         appear in an SRT file.
         """
-        return '\n'.join([str(self.num), self.time_range, *self.dialogue])
+        if self.dialogue:
+            dialogue = '\n'.join(self.dialogue)
+            return f'{self.num}\n{self.time_range}\n{dialogue}'
+
+        return f'{self.num}\n{self.time_range}'
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(num={self.num!r}, '
+                f'time_range={self.time_range!r}, dialogue={self.dialogue!r})')
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.num, self.time_range, self.dialogue, self.width) ==
+                (other.num, other.time_range, other.dialogue, other.width))
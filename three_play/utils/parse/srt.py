@@ -3,10 +3,48 @@ __all__ = ['total_seconds',
            'timestamp',
            'get_srt_duration',
            'remove_dialogue_for_first_ts',
-           'remove_dialogue_between']
+           'remove_dialogue_between',
+           'parse_srt',
+           'ParsedSRT']
 
 from datetime import timedelta
-from functools import reduce
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+
+class ParsedSRT(NamedTuple):
+    """
+    SRT file contents, along with the position of each time range line.
+
+    This can be built once with :func:`parse_srt`, and passed in place of
+    the contents to the functions in this module, so that the time ranges
+    are only located once when several of them are called on the same
+    contents.
+    """
+    contents: str
+    # A tuple of (line_start, arrow, line_end) for each time range line
+    arrow_lines: List[Tuple[int, int, int]]
+
+
+def parse_srt(srt_contents: str) -> ParsedSRT:
+    """Locate the time range lines in the SRT contents."""
+    return ParsedSRT(srt_contents, list(_iter_arrow_lines(srt_contents)))
+
+
+def _unpack(srt: Union[str, ParsedSRT], reverse=False
+            ) -> Tuple[str, Iterable[Tuple[int, int, int]]]:
+    """
+    Return a tuple of the SRT contents and its time range lines, given
+    either the contents or a :class:`ParsedSRT` object. If `reverse` is
+    true, the time range lines are returned starting from the end.
+    """
+    if isinstance(srt, ParsedSRT):
+        srt, arrow_lines = srt
+        return srt, reversed(arrow_lines) if reverse else arrow_lines
+
+    if reverse:
+        return srt, _iter_arrow_lines_reversed(srt)
+
+    return srt, _iter_arrow_lines(srt)
 
 
 def total_seconds(ts: str) -> str:
@@ -48,14 +86,25 @@ def total_ms(ts: str) -> int:
     https://stackoverflow.com/a/57610198
 
     """
-    try:
-        h_m_s, milliseconds = ts.replace('.', ',').rsplit(',', 1)
-    except ValueError:
-        h_m_s, milliseconds = ts.rsplit(':', 1)
+    # Fast path: the canonical "HH:mm:ss,SSS" form has fixed-width fields,
+    # so we can slice each one directly.
+    if len(ts) == 12 and ts[2] == ':' and ts[5] == ':' and ts[8] in ',.:':
+        return ((int(ts[0:2]) * 3600 + int(ts[3:5]) * 60 + int(ts[6:8])) * 1000
+                + int(ts[9:12]))
+
+    # Otherwise, locate the separator for the milliseconds part, scanning
+    # from the right.
+    sep = max(ts.rfind(','), ts.rfind('.'))
+    if sep < 0:
+        sep = ts.rfind(':')
+        if sep < 0:
+            raise ValueError(f'invalid timestamp: {ts!r}')
 
-    seconds = reduce(lambda sum, d: sum * 60 + int(d), h_m_s.split(':'), 0)
+    seconds = 0
+    for part in ts[:sep].split(':'):
+        seconds = seconds * 60 + int(part)
 
-    return (seconds * 1000) + int(milliseconds)
+    return seconds * 1000 + int(ts[sep + 1:])
 
 
 def timestamp(seconds: float = 0, *,
@@ -72,83 +121,194 @@ def timestamp(seconds: float = 0, *,
     return ts
 
 
-def get_srt_duration(srt_contents: str, default_end_seconds=0.0) -> float:
+def get_srt_duration(srt_contents: Union[str, ParsedSRT],
+                     default_end_seconds=0.0) -> float:
     """
     Gets the total duration (based on end timestamp) of an SRT file
     """
-    caption_text = srt_contents.split('\n')
-    captions_end_seconds = default_end_seconds
-    following_line = ''
-
-    for line in reversed(caption_text):
-        if '-->' in line:
-            # Fix: sometimes the durations will be listed for
-            # a blank line (no dialogue)
-            if not following_line.strip():
-                continue
+    srt_contents, arrow_lines = _unpack(srt_contents, reverse=True)
 
-            end = line.replace(' ', '').rsplit('-->', 1)[-1]
-            captions_end_seconds = float(total_seconds(end))
-            break
+    for _, arrow, line_end in arrow_lines:
+        # Fix: sometimes the durations will be listed for
+        # a blank line (no dialogue)
+        if _next_dialogue(srt_contents, line_end).strip():
+            # Use the position of the last arrow in the line
+            arrow = srt_contents.rfind('-->', arrow, line_end)
+            end_ts = srt_contents[arrow + 3:line_end].replace(' ', '')
+            return total_ms(end_ts) / 1000
 
-        following_line = line
+    return default_end_seconds
 
-    return captions_end_seconds
 
-
-def remove_dialogue_for_first_ts(srt_contents: str, ts: str) -> str:
+def remove_dialogue_for_first_ts(srt_contents: Union[str, ParsedSRT],
+                                 ts: str) -> str:
     """
     Removes dialogue under the first occurrence of a start timestamp
     in an SRT file. If the start timestamp is not found, return
     the `srt_contents` instead.
 
     """
-    caption_text = srt_contents.split('\n')
+    srt_contents, arrow_lines = _unpack(srt_contents)
 
-    for i, line in enumerate(caption_text):
-        if '-->' in line:
-            start_ts = line.split('-->', 1)[0].strip()
+    for line_start, arrow, line_end in arrow_lines:
+        start_ts = srt_contents[line_start:arrow].strip()
 
-            if start_ts == ts:
-                split_ind = i + 1
-                for j in range(split_ind, len(caption_text)):
-                    if not caption_text[j].strip():
-                        # Found the next blank line
-                        split_ind = j
-                        break
+        if start_ts == ts:
+            blank_start = _next_blank_line(srt_contents, line_end)
+            if blank_start < 0:
+                return srt_contents
 
-                # Return SRT contents with the first dialogue for that timestamp removed
-                return '\n'.join(caption_text[:i+1] + caption_text[split_ind:])
+            # Return SRT contents with the first dialogue for that timestamp removed
+            return srt_contents[:line_end + 1] + srt_contents[blank_start:]
 
     return srt_contents
 
 
-def remove_dialogue_between(srt_contents: str, start_ms: int, end_ms: int):
+def remove_dialogue_between(srt_contents: Union[str, ParsedSRT],
+                            start_ms: int, end_ms: int):
     """
     Remove all dialogue between `start_ms` and `end_ms`, non-inclusive of any
     dialogue for `end_ms` - note that values are in milliseconds.
 
     """
-    caption_text = srt_contents.split('\n')
-    srt_lines = []  # Lines to keep
-    exclude_dialogue = False
+    srt_contents, arrow_lines = _unpack(srt_contents)
+    find = srt_contents.find
+    end = len(srt_contents)
+    # (start, end) slices of the contents to keep
+    spans = []
+    keep_start = 0
+    # Position where the last excluded dialogue ends
+    excluded_end = 0
+
+    for line_start, arrow, line_end in arrow_lines:
+        if line_start < excluded_end:
+            # Already within excluded dialogue
+            continue
+
+        line_ts_ms = total_ms(srt_contents[line_start:arrow].strip())
+        if not start_ms <= line_ts_ms < end_ms:
+            continue
+
+        # If start timestamp of the line is between start_ts and end_ms,
+        # exclude all of its dialogue, up to the next blank line.
+        pos = line_end
+        while pos < end:
+            start = pos + 1
+            pos = find('\n', start)
+            if pos < 0:
+                pos = end
+
+            line = srt_contents[start:pos]
+            if not line.strip():
+                # Found blank line
+                break
 
-    for line in caption_text:
-        if '-->' in line:
-            start_ts = line.split('-->', 1)[0].strip()
-            line_ts_ms = total_ms(start_ts)
-            if start_ms <= line_ts_ms < end_ms:
-                # If start timestamp of the line is between start_ts and end_ms,
-                # exclude all of its dialogue
-                exclude_dialogue = True
+            if '-->' not in line:
+                # Exclude the line, along with its line break
+                if keep_start < start:
+                    spans.append((keep_start, start))
+                keep_start = pos + 1
 
-        elif exclude_dialogue:
-            if line.strip():
-                continue
-            else:
-                # Found blank line
-                exclude_dialogue = False
+        excluded_end = pos
+
+    if not keep_start:
+        # No dialogue was excluded
+        return srt_contents
+
+    if keep_start <= end:
+        spans.append((keep_start, end))
+    elif spans:
+        # The last line was excluded, so drop the line break before it
+        start, stop = spans[-1]
+        spans[-1] = (start, stop - 1)
+
+    return ''.join([srt_contents[start:stop] for start, stop in spans])
+
+
+def _iter_arrow_lines(srt_contents: str) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield a tuple of (line_start, arrow, line_end) for each line containing
+    an arrow '-->' (i.e. a time range) in the SRT contents, where `arrow`
+    is the position of the first arrow in the line.
+
+    The contents are scanned with :meth:`str.find`, so we don't need to
+    split them into a list of lines.
+    """
+    find = srt_contents.find
+    rfind = srt_contents.rfind
+    end = len(srt_contents)
+
+    arrow = find('-->')
+    while arrow >= 0:
+        line_start = rfind('\n', 0, arrow) + 1
+        line_end = find('\n', arrow)
+        if line_end < 0:
+            line_end = end
+
+        yield line_start, arrow, line_end
+
+        arrow = find('-->', line_end)
+
+
+def _iter_arrow_lines_reversed(srt_contents: str
+                               ) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield a tuple of (line_start, arrow, line_end) for each time range line
+    in the SRT contents, like :func:`_iter_arrow_lines` but starting from
+    the end.
+    """
+    find = srt_contents.find
+    rfind = srt_contents.rfind
+    end = len(srt_contents)
+
+    last_arrow = rfind('-->')
+    while last_arrow >= 0:
+        line_start = rfind('\n', 0, last_arrow) + 1
+        line_end = find('\n', last_arrow)
+        if line_end < 0:
+            line_end = end
+
+        yield line_start, find('-->', line_start), line_end
+
+        last_arrow = rfind('-->', 0, line_start)
+
+
+def _next_blank_line(srt_contents: str, line_end: int) -> int:
+    """
+    Return the start position of the first blank line after the line
+    ending at `line_end`, or -1 if there is no such line.
+    """
+    find = srt_contents.find
+    end = len(srt_contents)
+
+    while line_end < end:
+        start = line_end + 1
+        line_end = find('\n', start)
+        if line_end < 0:
+            line_end = end
+
+        if not srt_contents[start:line_end].strip():
+            return start
+
+    return -1
+
+
+def _next_dialogue(srt_contents: str, line_end: int) -> str:
+    """
+    Return the first line after the line ending at `line_end` which is
+    not a time range, or an empty string if there is no such line.
+    """
+    find = srt_contents.find
+    end = len(srt_contents)
+
+    while line_end < end:
+        start = line_end + 1
+        line_end = find('\n', start)
+        if line_end < 0:
+            line_end = end
 
-        srt_lines.append(line)
+        line = srt_contents[start:line_end]
+        if '-->' not in line:
+            return line
 
-    return '\n'.join(srt_lines or caption_text)
+    return ''
@@ -1,6 +1,7 @@
 __all__ = ['as_bool',
            'as_int']
 
+from functools import lru_cache
 from typing import Union, Any, Type
 
 
@@ -10,7 +11,7 @@ def as_bool(o: Union[str, bool], default=False):
     string. If `o` is None or an empty string, return `default` instead.
 
     """
-    if isinstance(o, bool):
+    if o is True or o is False:
         return o
 
     if not o:
@@ -20,7 +21,10 @@ def as_bool(o: Union[str, bool], default=False):
 
 
 def as_type(o: Any, _type: Type = str, default=None, raise_=True):
-    if isinstance(o, _type):
+    # An exact type check is a lot cheaper than `isinstance`, and covers
+    # the types we generally convert to (int, str, and bool); subclasses
+    # of `_type` are still passed through as-is.
+    if type(o) is _type or isinstance(o, _type):
         return o
 
     if not o:
@@ -42,5 +46,22 @@ def as_int(o: Union[str, int], default=0, raise_=True):
     If `o` cannot be converted to an int, raise an error if `raise_` is true,
     other return `default` instead.
 
+    """
+    if type(o) is int:
+        return o
+
+    # Only strings go through the cache, since other inputs (such as a
+    # list or dict) might not be hashable.
+    if type(o) is str:
+        return _as_int_cached(o, default, raise_)
+
+    return as_type(o, int, default, raise_)
+
+
+@lru_cache(maxsize=4096)
+def _as_int_cached(o: str, default, raise_):
+    """
+    Cached version of :func:`as_type` for ints, as the same (short) numeric
+    strings tend to be converted over and over again.
     """
     return as_type(o, int, default, raise_)
@@ -1,16 +1,13 @@
 """
 Time utilities
 """
-import sys
 import time
 
 
-# Preferred clock, based on which one is more accurate on a given system.
-# Ported from `requests`
-if sys.platform == 'win32':
-    try:  # Python 3.4+
-        preferred_clock = time.perf_counter
-    except AttributeError:  # Earlier than Python 3.
-        preferred_clock = time.clock
-else:
-    preferred_clock = time.time
+# Preferred clock for measuring elapsed time; `time.perf_counter` is the
+# highest-resolution (monotonic) clock available on all supported platforms.
+preferred_clock = time.perf_counter
+
+# Same as above, but returns an int number of nanoseconds; this avoids the
+# conversion to a float, for when the elapsed time might not be needed.
+preferred_clock_ns = time.perf_counter_ns
@@ -1,11 +1,13 @@
-import json
+import atexit
 import logging
-import math
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta, datetime
-from logging import INFO, ERROR
-from typing import List, Union, Optional, Dict, Any
+from itertools import chain
+from logging import INFO, WARNING, ERROR
+from typing import (List, Union, Optional, Dict, Any, Tuple, BinaryIO,
+                    Callable)
 
 from requests.exceptions import HTTPError, ConnectionError, RequestException
 from requests.models import Response
@@ -13,21 +15,29 @@ from requests.packages.urllib3 import Timeout
 from requests.sessions import Session
 
 from .models.requests import SessionWithRetry
+from ..config.requests import DEFAULT_POOL_MAXSIZE
 from .models.three_play_media import *
 from .models.three_play_media import TranslationOption
 from ..constants import *
 from ..errors import ADIsNotComplete
 from ..log import get_file_logger, LOG
-from ..utils.time_util import preferred_clock
+from ..utils.json_util import loads, dumps
+from ..utils.time_util import preferred_clock_ns
 
 
 LOG_FILENAME = os.getenv('LOG_FILE', '3play_requests.log')
 API_ERROR_LOG_LVL: int = logging._nameToLevel.get(ERROR_LOG_LEVEL, ERROR)
 
+# How boolean values are passed in the params for the 3Play API
+_BOOL_STR = {True: 'true', False: 'false'}
+
 if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):   # Running on Lambda
     pass
 else:
-    LOG = get_file_logger(filename=LOG_FILENAME, name=__file__, level=LOG_LEVEL)
+    # Keep the buffer for the request log small, so that few records are lost
+    # if the process is killed before they are flushed.
+    LOG = get_file_logger(filename=LOG_FILENAME, name=__file__, level=LOG_LEVEL,
+                          capacity=32)
 
 
 class ThreePlayApi:
@@ -38,58 +48,158 @@ class ThreePlayApi:
     API_ENDPOINT = 'https://api.3playmedia.com/v3/'
 
     # Configure using the env variable by default
-    __API_KEY = API_KEY
+    _api_key = API_KEY
+
+    # Shared session for all requests, so that connections to the 3Play API
+    # are kept alive in a pool and reused across calls.
+    _session: Optional[Session] = None
+    _session_lock = threading.Lock()
+
+    # Shared pool of threads to fetch pages of results in parallel; this is
+    # sized to match the max number of connections kept alive by the session.
+    # Bulk orders don't use this pool, as each order can take up to a minute.
+    _pool: Optional[ThreadPoolExecutor] = None
+    _pool_lock = threading.Lock()
 
     @classmethod
     def configure(cls, project_api_key):
-        cls.__API_KEY = project_api_key
+        cls._api_key = project_api_key
+
+        if cls._session is not None:
+            cls._session.params['api_key'] = project_api_key
 
     @classmethod
     def _get_session(cls) -> Session:
-        session = SessionWithRetry()
-        session.params = {'api_key': cls.__API_KEY}
+        session = cls._session
+
+        if session is None:
+            with cls._session_lock:
+                # Check again, in case another thread created the session
+                session = cls._session
+                if session is None:
+                    session = SessionWithRetry()
+                    session.params = {'api_key': cls._api_key}
+                    cls._session = session
 
         return session
 
+    @classmethod
+    def _get_pool(cls) -> ThreadPoolExecutor:
+        pool = cls._pool
+
+        if pool is None:
+            with cls._pool_lock:
+                # Check again, in case another thread created the pool
+                pool = cls._pool
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=DEFAULT_POOL_MAXSIZE,
+                                              thread_name_prefix='3play')
+                    atexit.register(pool.shutdown, wait=False)
+                    cls._pool = pool
+
+        return pool
+
     @classmethod
     def get(cls, api, **kwargs):
         return cls.request('GET', api, **kwargs)
 
     @classmethod
-    def request(cls, method, api, log_level=INFO, **kwargs):
-        response = cls._request_page(method, api, log_level=log_level, **kwargs)
+    def request(cls, method, api, log_level=INFO, expected_pages=None,
+                max_results=None,
+                row_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                **kwargs):
+        """
+        Makes a request to the 3Play API. For a paginated response, the
+        remaining pages are requested in parallel and their results are
+        added to the response data.
+
+        :param expected_pages: The number of pages the caller expects, if
+          it's known in advance; pages 2 to `expected_pages` are then
+          requested in parallel with the first page.
+        :param max_results: The max number of results the caller needs; only
+          the pages needed for these results are requested, and the response
+          data is truncated to this length.
+        :param row_filter: If passed, only results in the response data for
+          which this returns true are kept. Note that `max_results` then
+          doesn't limit the pages requested, as rows might be filtered out.
+        """
+        future_to_page = {}
+
+        def submit_pages(first, last):
+            pool = cls._get_pool()
+            for page in range(first, last + 1):
+                future = pool.submit(cls._request_page,
+                                     method, api, page, log_level, **kwargs)
+                future_to_page[future] = page
+
+        if expected_pages and expected_pages > 1:
+            submit_pages(2, expected_pages)
+
+        try:
+            response = cls._request_page(method, api, log_level=log_level, **kwargs)
+        except Exception:
+            for future in future_to_page:
+                future.cancel()
+            raise
+
+        if row_filter is not None and response.get('data'):
+            response['data'] = [row for row in response['data'] if row_filter(row)]
+
+        pagination = response.get('pagination')
 
-        if 'pagination' in response:
-            per_page = response['pagination']['per_page']
-            total_entries = response['pagination']['total_entries']
+        # Fast path: a single page (or no pagination), with no other pages
+        # requested in advance and no results to truncate.
+        if not (future_to_page or max_results) and (
+                pagination is None
+                or pagination['total_entries'] <= pagination['per_page']):
+            return response
 
-            num_pages = math.ceil(total_entries / per_page)
-            if num_pages > 1:
+        num_pages = 1
 
-                # Need if the pages are expected to contain sorted results
-                page_to_data = {}
+        if pagination is not None:
+            per_page = pagination['per_page']
+            total_entries = pagination['total_entries']
 
-                with ThreadPoolExecutor(max_workers=5) as pool:
-                    future_to_page = {pool.submit(cls._request_page,
-                                                  method, api, page, log_level, **kwargs): page
-                                      for page in range(2, num_pages + 1)}
+            # Round up, using integer division
+            num_pages = -(-total_entries // per_page)
+            if max_results and row_filter is None:
+                num_pages = min(num_pages, -(-max_results // per_page))
 
-                    for future in as_completed(future_to_page):
-                        page = future_to_page[future]
+            # Submit any remaining pages as a single batch
+            submit_pages(len(future_to_page) + 2, num_pages)
 
-                        try:
-                            page_data = future.result().get('data') or []
+        # Don't wait on pages requested in advance, if there are fewer pages
+        for future, page in list(future_to_page.items()):
+            if page > num_pages:
+                future.cancel()
+                del future_to_page[future]
 
-                        except Exception as e:
-                            LOG.log(API_ERROR_LOG_LVL,
-                                    'Page %d generated an exception: (%s) %s',
-                                    page, type(e).__name__, e)
+        if future_to_page:
 
-                        else:
-                            page_to_data[page] = page_data
+            # Slot for the data in each page from 2 onwards, as the pages are
+            # expected to contain sorted results; pages with errors are empty.
+            pages_out = [()] * (num_pages - 1)
 
-                for _, page_data in sorted(page_to_data.items()):
-                    response['data'].extend(page_data)
+            for future in as_completed(future_to_page):
+                page = future_to_page[future]
+
+                try:
+                    page_data = future.result().get('data') or []
+
+                except Exception as e:
+                    LOG.log(API_ERROR_LOG_LVL,
+                            'Page %d generated an exception: (%s) %s',
+                            page, type(e).__name__, e)
+
+                else:
+                    if row_filter is not None:
+                        page_data = [row for row in page_data if row_filter(row)]
+                    pages_out[page - 2] = page_data
+
+            response['data'].extend(chain.from_iterable(pages_out))
+
+        if max_results and pagination is not None:
+            del response['data'][max_results:]
 
         return response
 
@@ -105,12 +215,13 @@ class ThreePlayApi:
         errors.
 
         """
-        url = cls.API_ENDPOINT + api.lstrip('/')
-        params = (kwargs.pop('params', None) or {}).copy()
+        url = cls.API_ENDPOINT + (api[1:] if api.startswith('/') else api)
+        # Only copy the params when we need to add the page number
+        params = kwargs.pop('params', None)
         if page:
-            params['page'] = page
+            params = {**params, 'page': page} if params else {'page': page}
 
-        start = preferred_clock()
+        start = preferred_clock_ns()
 
         try:
             r = cls._get_session().request(method, url, params=params, **kwargs)
@@ -120,52 +231,72 @@ class ThreePlayApi:
             cls._handle_response(method, api, params, start=start, error=e)
 
         else:
-            # A response was received, check status code and raise any errors.
-            cls._handle_response(method, api, params, r, log_level=log_level)
-            return r.json()
+            if r.ok:
+                # The request was a success.
+                if LOG.isEnabledFor(log_level):
+                    LOG.log(log_level, '[%s] %s /%s, params=%s, status=%d',
+                            r.elapsed, method.upper(), api,
+                            cls._params_to_log(params), r.status_code)
+
+                return loads(r.content)
+
+            # A 4xx or 5xx status was returned, log and raise the error.
+            cls._handle_response(method, api, params, r)
 
     @staticmethod
     def _handle_response(
             method: str, api: str, params: Optional[Dict] = None,
-            r: Optional[Response] = None, start: Optional[float] = 0.0,
-            error: Optional[RequestException] = None,
-            log_level=INFO):
+            r: Optional[Response] = None, start: Optional[int] = 0,
+            error: Optional[RequestException] = None):
         """
-        Process and log the :class:`Response` returned for a request
-
-        Requires either `r` or `error` to be passed in to the method
+        Log and raise the error for a failed request, given either the
+        :class:`Response` with an error status, or the `error` raised when
+        a response was not received.
         """
         method = method.upper()
-        params = (params or {}).copy()
-
-        # Remove 'callback' since the API key could be in the url, and we don't want to log it
-        params.pop('callback', None)
 
         if r is not None:
             # An HTTP response was received.
             try:
                 r.raise_for_status()
             except HTTPError:
-                LOG.log(API_ERROR_LOG_LVL,
-                        '[%s] %s /%s, params=%s, status=%d, reason=%s, response=%s',
-                        r.elapsed, method, api, json.dumps(params),
-                        r.status_code, r.reason, r.text)
+                if LOG.isEnabledFor(API_ERROR_LOG_LVL):
+                    LOG.log(API_ERROR_LOG_LVL,
+                            '[%s] %s /%s, params=%s, status=%d, reason=%s, response=%s',
+                            r.elapsed, method, api, ThreePlayApi._params_to_log(params),
+                            r.status_code, r.reason, r.text)
                 raise
-            # The request was a success.
-            LOG.log(log_level, '[%s] %s /%s, params=%s, status=%d',
-                    r.elapsed, method, api, json.dumps(params),
-                    r.status_code)
 
         else:
             # A response was not received, as most likely the request timed out.
-            diff_sec = preferred_clock() - start
-            elapsed = timedelta(seconds=diff_sec)
-            error_code = type(error).__name__
-
-            LOG.warning('[%s] %s /%s, params=%s, error=%s',
-                        elapsed, method, api, json.dumps(params), error_code)
+            if LOG.isEnabledFor(WARNING):
+                diff_us = (preferred_clock_ns() - start) // 1000
+                elapsed = timedelta(microseconds=diff_us)
+                error_code = type(error).__name__
+
+                LOG.warning('[%s] %s /%s, params=%s, error=%s',
+                            elapsed, method, api, ThreePlayApi._params_to_log(params),
+                            error_code)
             raise error
 
+    @staticmethod
+    def _params_to_log(params: Optional[Dict]) -> str:
+        """
+        Serialize the params for a request to JSON, so they can be logged.
+
+        Only call this once we know the message will be logged, so that we
+        don't serialize the params for every request (or page) otherwise.
+        """
+        if not params:
+            return '{}'
+
+        # Remove 'callback' since the API key could be in the url, and we don't want to log it
+        if 'callback' in params:
+            params = params.copy()
+            del params['callback']
+
+        return dumps(params)
+
     @classmethod
     def list_platform_integrations(cls):
         r = cls.get('video_platform_integrations')
@@ -173,7 +304,7 @@ class ThreePlayApi:
 
     @classmethod
     def list_turnaround_levels(cls, show_prices=True):
-        params = {'prices': str(show_prices).lower()}
+        params = {'prices': _BOOL_STR[show_prices]}
 
         r = cls.get('turnaround_levels', params=params)
         return r
@@ -237,6 +368,67 @@ class ThreePlayApi:
 
         return file_id, success
 
+    @classmethod
+    def order_transcription_bulk(
+            cls, videos: List[Dict[str, Any]],
+            turnaround_level: Turnaround = Turnaround.STANDARD,
+            callback=None,
+            max_concurrency=DEFAULT_BULK_CONCURRENCY
+    ) -> List[Tuple[Optional[int], bool]]:
+        """
+        Orders a transcription for each video in parallel, where each element
+        in `videos` is a dict of keyword arguments for
+        :meth:`order_transcription` (ex. `video_id`, `video_name`, and
+        `language`).
+
+        At most `max_concurrency` videos are ordered at a time.
+
+        Returns a list of (media_file_id, success) tuples, in the same order
+        as `videos`. The `media_file_id` is None if the media file could not
+        be created.
+
+        """
+        return cls._order_bulk(cls.order_transcription, videos, max_concurrency,
+                               turnaround_level=turnaround_level,
+                               callback=callback)
+
+    @classmethod
+    def _order_bulk(cls, order, videos: List[Dict[str, Any]],
+                    max_concurrency: int,
+                    **kwargs) -> List[Tuple[Optional[int], bool]]:
+        """
+        Call `order` with the keyword arguments for each video, so that each
+        video's media file is created and then its order placed, independently
+        of the other videos.
+
+        The orders are placed on a separate pool of up to `max_concurrency`
+        threads, rather than the shared pool, since each order can take up
+        to a minute and would otherwise hold up requests for pages of results.
+        """
+        if not videos:
+            return []
+
+        results = []
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(videos)),
+                                thread_name_prefix='3play-order') as pool:
+            # Any arguments for the video itself (ex. `callback`) take
+            # precedence over the ones shared by all videos.
+            futures = [pool.submit(order, **{**kwargs, **video})
+                       for video in videos]
+
+            for video, future in zip(videos, futures):
+                try:
+                    results.append(future.result())
+
+                except Exception as e:
+                    LOG.log(API_ERROR_LOG_LVL,
+                            '%s: Order generated an exception: (%s) %s',
+                            video.get('video_id'), type(e).__name__, e)
+                    results.append((None, False))
+
+        return results
+
     @classmethod
     def create_media_file(cls, video_id: str, video_name: str, language: Language,
                           file_name: str = None, integration_id=None,
@@ -251,14 +443,13 @@ class ThreePlayApi:
         if not file_name:
             file_name = video_name
 
-        labels = [f'{label}:{value}' for label, value in labels.items()]
-
         params = {'language_id': language.value,
                   'name': file_name,
                   'attribute1': attr1,
                   'attribute2': attr2,
                   'attribute3': attr3,
-                  'label': ','.join(labels),
+                  'label': ','.join(f'{label}:{value}'
+                                    for label, value in (labels or {}).items()),
                   'reference_id': video_id,
                   'integration_id': integration_id or INTEGRATION_ID}
 
@@ -296,7 +487,7 @@ class ThreePlayApi:
         """
         params = {'media_file_id': media_file_id,
                   'language_id': language.value,
-                  'autoparagraph': str(auto_paragraph).lower()}
+                  'autoparagraph': _BOOL_STR[auto_paragraph]}
 
         files = {'caption_file': ('captions.srt', caption_file_contents)}
 
@@ -322,7 +513,7 @@ class ThreePlayApi:
         timeout = Timeout(read=read_timeout or None)
 
         params = {'media_file_id': media_file_id,
-                  'extended': str(extended).lower(),
+                  'extended': _BOOL_STR[extended],
                   'turnaround_level_id': turnaround_level.id}
         if callback:
             params['callback'] = callback
@@ -377,6 +568,26 @@ class ThreePlayApi:
 
         return file_id, success
 
+    @classmethod
+    def order_asr_bulk(
+            cls, videos: List[Dict[str, Any]],
+            callback=None,
+            max_concurrency=DEFAULT_BULK_CONCURRENCY
+    ) -> List[Tuple[Optional[int], bool]]:
+        """
+        Order ASR for each video in parallel, where each element in `videos`
+        is a dict of keyword arguments for :meth:`order_asr`.
+
+        At most `max_concurrency` videos are ordered at a time.
+
+        Returns a list of (media_file_id, success) tuples, in the same order
+        as `videos`. The `media_file_id` is None if the media file could not
+        be created.
+
+        """
+        return cls._order_bulk(cls.order_asr, videos, max_concurrency,
+                               callback=callback)
+
     @classmethod
     def order_asr_for_media_file(
             cls, media_file_id: int,
@@ -474,7 +685,8 @@ class ThreePlayApi:
                         attr1: str = None, attr2: str = None, attr3: str = None,
                         label: str = None, by_default=False,
                         status: TranscriptStatus = None, language: Language = None, video_id=None,
-                        per_page=100, sort_by_created=False, latest_first=False):
+                        per_page=DEFAULT_PER_PAGE, sort_by_created=False, latest_first=False,
+                        expected_pages=None, max_results=None):
         params = {'per_page': per_page}
         if transcript_id:
             params['id'] = int(transcript_id)
@@ -503,12 +715,19 @@ class ThreePlayApi:
         if by_default:
             params['default'] = 'true'
 
-        data = cls.request('GET', 'transcripts', params=params)
         # This might be a bug, but I noticed that sometimes when requesting
         # 'complete' transcripts, we also get a few 'in progress' transcripts
         if status:
-            results = data.get('data', [])
-            data['data'] = [r for r in results if r['status'] == status.value]
+            status_value = status.value
+
+            def row_filter(row):
+                return row['status'] == status_value
+        else:
+            row_filter = None
+
+        data = cls.request('GET', 'transcripts', params=params,
+                           expected_pages=expected_pages,
+                           max_results=max_results, row_filter=row_filter)
 
         return data
 
@@ -517,7 +736,7 @@ class ThreePlayApi:
             cls, transcript_id=None, media_file_id=None, media_file_name=None,
             attr1: str = None, attr2: str = None, attr3: str = None,
             status: TranscriptStatus = None,
-            language: Language = None, video_id=None, per_page=100,
+            language: Language = None, video_id=None, per_page=DEFAULT_PER_PAGE,
             sort_by_created=False,
             created_after: datetime = None):
         params = {'per_page': per_page}
@@ -576,8 +795,8 @@ class ThreePlayApi:
     def list_media_files(cls, name=None, name_partial=None,
                          video_id=None,
                          attr1: str = None, attr2: str = None, attr3: str = None,
-                         per_page=100, sort_by_created=False,
-                         latest_first=False):
+                         per_page=DEFAULT_PER_PAGE, sort_by_created=False,
+                         latest_first=False, expected_pages=None):
 
         params = {'per_page': per_page}
         if name:
@@ -597,7 +816,7 @@ class ThreePlayApi:
             if latest_first:
                 params['sort_dir'] = 'desc'
 
-        return cls.get('files', params=params)
+        return cls.get('files', params=params, expected_pages=expected_pages)
 
     @classmethod
     def cancel_transcript(cls, transcript_id: int):
@@ -688,19 +907,38 @@ class ThreePlayApi:
     @classmethod
     def download_ad_asset(
             cls, video_id: Optional[str] = None, ad_id: Optional[int] = None,
-            media_format='mp3') -> bytes:
+            media_format='mp3',
+            dst: Union[str, os.PathLike, BinaryIO, None] = None,
+            chunk_size: int = 1 << 16) -> Optional[bytes]:
         """
         Download audio description media (description and source mixed)
 
-        Returns the downloaded mp3 file as bytes
+        Returns the downloaded mp3 file as bytes, unless `dst` is passed in;
+        in that case, the file is instead written to `dst` (a file path, or
+        a file opened in binary mode) in chunks of `chunk_size` bytes, so the
+        whole file is never held in memory.
 
         """
         url = cls.get_ad_asset_url(video_id, ad_id, media_format)
 
-        r = Session().get(url)
-        r.raise_for_status()
+        # Setting the API key to None omits it from the params of the shared
+        # session, as we don't want to send it to another host.
+        with cls._get_session().get(url, params={'api_key': None},
+                                    stream=dst is not None) as r:
+            r.raise_for_status()
 
-        return r.content
+            if dst is None:
+                return r.content
+
+            chunks = r.iter_content(chunk_size=chunk_size)
+
+            if isinstance(dst, (str, os.PathLike)):
+                with open(dst, 'wb') as f:
+                    f.writelines(chunks)
+            else:
+                dst.writelines(chunks)
+
+        return None
 
     @classmethod
     def get_expiring_edit_url(
@@ -717,13 +955,16 @@ class ThreePlayApi:
         if video_id:
             LOG.info('%s: Retrieving latest transcript for video', video_id)
 
+            # Only the latest transcript is needed, so there's no need to
+            # request more than the first page.
             transcript_orders = cls.get_transcripts(
-                video_id=video_id, sort_by_created=True)['data']
+                video_id=video_id, sort_by_created=True, latest_first=True,
+                per_page=1, max_results=1)['data']
 
             if not transcript_orders:
                 return None
 
-            transcript_id = transcript_orders[-1]['id']
+            transcript_id = transcript_orders[0]['id']
 
         r = cls.request(
             'GET', f'transcripts/{transcript_id}/expiring_editing_link',
@@ -6,12 +6,21 @@ from typing import Dict, List, Union, Tuple, Type
 
 from .api import ThreePlayApi
 from .models.three_play_media import *
+from ..constants import CACHE_TTL, HELPER_POOL_SIZE
 from ..errors import *
 from ..log import LOG
+from ..utils.cache import ttl_cache
 from ..utils.parse import (total_ms, remove_dialogue_between,
                            remove_dialogue_for_first_ts)
 
 
+# Shared pool of threads to make independent API calls in parallel. Note that
+# this is separate from the pool in `ThreePlayApi`, as any calls made here
+# might in turn need to fetch pages of results on that pool.
+_POOL = ThreadPoolExecutor(max_workers=HELPER_POOL_SIZE,
+                           thread_name_prefix='3play-helper')
+
+
 class ThreePlayHelper:
     """
     Helper class for interacting with 3Play API, which further simplifies
@@ -31,11 +40,10 @@ class ThreePlayHelper:
         if `turnaround_name` is invalid, an :class:`ThreePlayError` is raised.
         """
         if turnaround_name:
-            try:
-                turnaround = cls[turnaround_name.upper().replace(' ', '_')]
-                return turnaround
-            except KeyError:
+            turnaround = cls.lookup(turnaround_name)
+            if turnaround is None:
                 raise InvalidTurnaround(turnaround_name)
+            return turnaround
 
         return default
 
@@ -50,49 +58,54 @@ class ThreePlayHelper:
 
         """
         if transcripts is None:
+            # Only the default transcripts are needed below
             t = ThreePlayApi.get_transcripts(
-                video_id=video_id, sort_by_created=True)
+                video_id=video_id, sort_by_created=True, by_default=True)
             transcripts = t['data']
 
         # Iterate over transcripts (most recent first) and find the first media file
         # with a default transcript - this is the transcript we will use to determine the
         # primary or source language.
-        for transcript in reversed(transcripts):
-            if transcript.get('default') is True:
-                media_file_id = transcript['media_file_id']
-                transcript_id = transcript['id']
-                status = TranscriptStatus(transcript['status'])
-                lang_id = transcript['language_id']
-
-                if status is TranscriptStatus.CANCELLED:
-                    continue
-
-                LOG.info('Found latest transcript for video. '
-                         'file_id=%d, transcript_id=%d', media_file_id, transcript_id)
-                try:
-                    return Language(int(lang_id))
-                except (ValueError, TypeError):
-                    raise InvalidLanguageId(lang_id, transcript_id)
-
-        raise NoSuchTranscript(video_id, has_lang_input=True)
+        cancelled = TranscriptStatus.CANCELLED.value
+        transcript = next((t for t in reversed(transcripts)
+                           if t.get('default') is True
+                           and t['status'] != cancelled), None)
+        if transcript is None:
+            raise NoSuchTranscript(video_id, has_lang_input=True)
+
+        transcript_id = transcript['id']
+        lang_id = transcript['language_id']
+
+        LOG.info('Found latest transcript for video. '
+                 'file_id=%d, transcript_id=%d',
+                 transcript['media_file_id'], transcript_id)
+        try:
+            return Language(int(lang_id))
+        except (ValueError, TypeError):
+            raise InvalidLanguageId(lang_id, transcript_id)
 
     @staticmethod
     def get_transcripts(video_id, status: TranscriptStatus = None,
                         by_default=False, latest_first=False) -> List[Dict]:
         """
         Get all transcripts for a given video.
-        """
-        t = ThreePlayApi.get_transcripts(
-            video_id=video_id, sort_by_created=True,
-            status=status, by_default=by_default, latest_first=latest_first)
-        transcripts = t['data']
 
-        return transcripts
+        The results are cached for up to `CACHE_TTL` seconds, if it's set.
+        Note that any orders placed with :class:`ThreePlayApi` in the meantime
+        won't show up until the cached results expire.
+        """
+        # Copy the cached list, in case the caller modifies it
+        return list(_get_transcripts(video_id, status, by_default, latest_first))
 
     @staticmethod
+    @ttl_cache(ttl=CACHE_TTL)
     def get_latest_media_file(video_id: str) -> MediaFile:
         """
         Get the latest media file for a video.
+
+        The result is cached for up to `CACHE_TTL` seconds, if it's set.
+        Note that any media file created with :class:`ThreePlayApi` in the
+        meantime won't be returned until the cached result expires.
         """
         response = ThreePlayApi.list_media_files(
             video_id=video_id, sort_by_created=True, latest_first=True)
@@ -106,10 +119,23 @@ class ThreePlayHelper:
 
     @classmethod
     def get_default_transcripts(cls, video_id, status: TranscriptStatus = None,
-                                latest_first=False) -> List[Dict]:
+                                latest_first=False,
+                                transcripts: List[Dict] = None) -> List[Dict]:
         """
         Get default transcripts for a video
+
+        If `transcripts` (oldest first, as returned by :meth:`get_transcripts`)
+        are passed in, they are filtered instead of making an API call.
         """
+        if transcripts is not None:
+            default_transcripts = [
+                t for t in transcripts if t.get('default') is True
+                and (status is None or t['status'] == status.value)]
+            if latest_first:
+                default_transcripts.reverse()
+
+            return default_transcripts
+
         default_transcripts = cls.get_transcripts(
             video_id, status, by_default=True, latest_first=latest_first)
 
@@ -122,7 +148,13 @@ class ThreePlayHelper:
         for a given video, or given a list of transcripts for a video.
         """
         if transcripts is None:
-            transcripts = ThreePlayHelper.get_transcripts(video_id)
+            # Always get the latest statuses here, rather than cached results,
+            # so that any recent orders for the video are seen.
+            t = ThreePlayApi.get_transcripts(video_id=video_id,
+                                             sort_by_created=True)
+            transcripts = t['data']
+
+        transcript_ids = []
 
         for transcript in transcripts:
             transcript_id = transcript['id']
@@ -136,7 +168,30 @@ class ThreePlayHelper:
                 # if it was a success.
                 LOG.info('Attempting to cancel a %s transcript (%d)',
                          status.value, transcript_id)
-                ThreePlayApi.cancel_transcript(transcript_id)
+                transcript_ids.append(transcript_id)
+
+        if not transcript_ids:
+            return
+
+        try:
+            # Cancel the transcripts in parallel, and wait for all to complete
+            if len(transcript_ids) == 1:
+                ThreePlayApi.cancel_transcript(transcript_ids[0])
+            else:
+                list(_POOL.map(ThreePlayApi.cancel_transcript, transcript_ids))
+
+        finally:
+            # The statuses of the transcripts for the video will have changed,
+            # even if only some of them were cancelled.
+            if video_id is None:
+                _get_transcripts.cache_clear()
+            else:
+                _get_transcripts.cache_invalidate(
+                    lambda args: args['video_id'] == video_id)
+
+            cancelled = set(transcript_ids)
+            _get_formatted_text.cache_invalidate(
+                lambda args: args['transcript_id'] in cancelled)
 
     @staticmethod
     def get_active_transcripts(video_id) -> Dict[int, Language]:
@@ -152,21 +207,7 @@ class ThreePlayHelper:
         is invalid.
 
         """
-        t = ThreePlayApi.get_transcripts(video_id=video_id, sort_by_created=True,
-                                         status=TranscriptStatus.COMPLETE)
-        transcripts = t['data']
-
-        # Iterate over transcripts (most recent first) and find the first media file
-        # with a default transcript - this is the file we will use for transcripts.
-        for transcript in reversed(transcripts):
-            if transcript.get('default') is True:
-                media_file_id = transcript['media_file_id']
-                break
-        else:
-            raise NoSuchTranscript(video_id)
-
-        file_transcripts = [transcript for transcript in transcripts
-                            if transcript['media_file_id'] == media_file_id]
+        file_transcripts = ThreePlayHelper._get_active_file_transcripts(video_id)
 
         transcript_id_to_language = {}
         for transcript in file_transcripts:
@@ -193,25 +234,46 @@ class ThreePlayHelper:
         Raises an ThreePlayError if no transcripts are found, or a source language
         is invalid.
 
+        """
+        file_transcripts = [Transcript.from_row(transcript)
+                            for transcript in
+                            ThreePlayHelper._get_active_file_transcripts(video_id)]
+
+        return file_transcripts
+
+    @staticmethod
+    def _get_active_file_transcripts(video_id) -> List[Dict]:
+        """
+        Returns the complete transcripts for the latest media file (for a video)
+        which has a complete default transcript.
+
+        Raises an ThreePlayError if no such transcript is found.
+
         """
         t = ThreePlayApi.get_transcripts(video_id=video_id, sort_by_created=True,
                                          status=TranscriptStatus.COMPLETE)
         transcripts = t['data']
 
-        # Iterate over transcripts (most recent first) and find the first media file
-        # with a default transcript - this is the file we will use for transcripts.
-        for transcript in reversed(transcripts):
+        # Group the transcripts (oldest first) by media file, and find the latest
+        # media file with a default transcript - this is the file we will use for
+        # transcripts. This is done in a single pass over the transcripts.
+        file_to_transcripts: Dict[int, List[Dict]] = {}
+        media_file_id = None
+
+        for transcript in transcripts:
+            file_id = transcript['media_file_id']
+            file_transcripts = file_to_transcripts.get(file_id)
+            if file_transcripts is None:
+                file_transcripts = file_to_transcripts[file_id] = []
+            file_transcripts.append(transcript)
+
             if transcript.get('default') is True:
-                media_file_id = transcript['media_file_id']
-                break
-        else:
-            raise NoSuchTranscript(video_id)
+                media_file_id = file_id
 
-        file_transcripts = [Transcript(media_file=None, **transcript)
-                            for transcript in transcripts
-                            if transcript['media_file_id'] == media_file_id]
+        if media_file_id is None:
+            raise NoSuchTranscript(video_id)
 
-        return file_transcripts
+        return file_to_transcripts[media_file_id]
 
     @staticmethod
     def cut_transcript_in_middle(
@@ -238,9 +300,9 @@ class ThreePlayHelper:
             # We will also need to remove unneeded dialogue later.
             first_end_ms += second_offset_ms
 
-        clips = [f'0,{first_end_ms}', f'{second_start_ms},{second_end_ms}']
+        clips = (f'0,{first_end_ms}', f'{second_start_ms},{second_end_ms}')
 
-        text = ThreePlayApi.get_formatted_transcript_text(transcript_id, clips=clips)
+        text = _get_formatted_text(transcript_id, clips=clips)
 
         if second_offset_ms:
             text = remove_dialogue_between(text, initial_first_end_ms, first_end_ms)
@@ -263,14 +325,55 @@ class ThreePlayHelper:
         :return: A tuple of (original_text, trimmed_text)
 
         """
-        with ThreadPoolExecutor(max_workers=2) as pool:
-            original_text_future = pool.submit(
-                ThreePlayApi.get_formatted_transcript_text, transcript_id)
-            trimmed_text_future = pool.submit(
-                ThreePlayApi.get_formatted_transcript_text, transcript_id,
-                start_seconds=start_seconds)
+        return ThreePlayHelper.get_both_transcript_text_bulk(
+            [(transcript_id, start_seconds)])[0]
+
+    @staticmethod
+    def get_both_transcript_text_bulk(
+        transcripts: List[Tuple[int, Union[str, int, float]]]
+    ) -> List[Tuple[str, str]]:
+        """
+        Retrieve the original and trimmed transcript text for each pair of
+        (transcript_id, start_seconds) in `transcripts`, with all requests
+        made in parallel.
+
+        See :meth:`get_both_transcript_text` for more info.
+
+        :return: A list of (original_text, trimmed_text), in the same order
+            as `transcripts`
+
+        """
+        futures = [(_POOL.submit(_get_formatted_text, transcript_id),
+                    _POOL.submit(_get_formatted_text, transcript_id,
+                                 start_seconds=start_seconds))
+                   for transcript_id, start_seconds in transcripts]
+
+        return [(original_text_future.result(), trimmed_text_future.result())
+                for original_text_future, trimmed_text_future in futures]
 
-        original_text = original_text_future.result()
-        trimmed_text = trimmed_text_future.result()
 
-        return original_text, trimmed_text
+@ttl_cache(ttl=CACHE_TTL)
+def _get_transcripts(video_id, status: TranscriptStatus = None,
+                     by_default=False, latest_first=False) -> List[Dict]:
+    """
+    Get all transcripts for a given video, and cache the results.
+    """
+    t = ThreePlayApi.get_transcripts(
+        video_id=video_id, sort_by_created=True,
+        status=status, by_default=by_default, latest_first=latest_first)
+    transcripts = t['data']
+
+    return transcripts
+
+
+@ttl_cache(maxsize=512, ttl=CACHE_TTL)
+def _get_formatted_text(transcript_id: int,
+                        start_seconds: Union[str, int, float, None] = None,
+                        clips: Tuple[str, ...] = None) -> str:
+    """
+    Get formatted text (in SRT format) for a transcript, and cache the
+    results. Note that `clips` needs to be a tuple, so it can be hashed.
+    """
+    return ThreePlayApi.get_formatted_transcript_text(
+        transcript_id, start_seconds=start_seconds,
+        clips=list(clips) if clips else None)
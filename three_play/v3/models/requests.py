@@ -5,7 +5,8 @@ from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
 from ...config.requests import (
-    DEFAULT_MAX_RETRIES, DEFAULT_BACKOFF_FACTOR, DEFAULT_STATUS_FORCE_LIST)
+    DEFAULT_MAX_RETRIES, DEFAULT_BACKOFF_FACTOR, DEFAULT_STATUS_FORCE_LIST,
+    DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE)
 
 
 class SessionWithRetry(Session):
@@ -13,25 +14,36 @@ class SessionWithRetry(Session):
     def __init__(self, auth=None,
                  num_retries=DEFAULT_MAX_RETRIES,
                  backoff_factor=DEFAULT_BACKOFF_FACTOR,
-                 additional_status_force_list: Optional[List[int]] = None):
+                 additional_status_force_list: Optional[List[int]] = None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE):
 
         super().__init__()
         self.auth = auth
 
-        status_force_list = DEFAULT_STATUS_FORCE_LIST
+        # Copy the defaults, so the module-level list isn't modified below
+        status_force_list = list(DEFAULT_STATUS_FORCE_LIST)
         # Retry on additional status codes (ex. HTTP 400) if needed
         if additional_status_force_list:
             status_force_list.extend(additional_status_force_list)
 
-        retry_strategy = Retry(
+        retry_kwargs = dict(
             read=0,
             total=num_retries,
             status_forcelist=status_force_list,
-            method_whitelist=["HEAD", "GET", "PUT", "POST", "DELETE", "OPTIONS", "TRACE"],
             backoff_factor=backoff_factor
         )
+        methods = ["HEAD", "GET", "PUT", "POST", "DELETE", "OPTIONS", "TRACE"]
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        try:
+            retry_strategy = Retry(allowed_methods=methods, **retry_kwargs)
+        except TypeError:
+            # `allowed_methods` was named `method_whitelist` before urllib3 1.26
+            retry_strategy = Retry(method_whitelist=methods, **retry_kwargs)
+
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              max_retries=retry_strategy)
 
         self.mount("https://", adapter)
         self.mount("http://", adapter)
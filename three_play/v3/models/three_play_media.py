@@ -17,7 +17,9 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Optional
 
 
 LOG = logging.getLogger(__name__)
@@ -64,8 +66,20 @@ class TranslationOption(Enum):
         """
         Return the translation option from source to target language.
         """
-        name = f'{source_language.name}_TO_{target_language.name}'
-        return cls.__members__[name]
+        # Map each (source, target) language pair to its option, built on
+        # first use.
+        lookup = cls.__dict__.get('_LOOKUP')
+        if lookup is None:
+            lookup = {}
+            for name, option in cls.__members__.items():
+                source, target = name.split('_TO_')
+                lookup[Language[source], Language[target]] = option
+            cls._LOOKUP = lookup
+
+        try:
+            return lookup[source_language, target_language]
+        except KeyError:
+            raise KeyError(f'{source_language.name}_TO_{target_language.name}') from None
 
 
 class TranscriptFormat(Enum):
@@ -83,9 +97,13 @@ class TranscriptStatus(Enum):
     COMPLETE = 'complete'
     CANCELLED = 'cancelled'
 
+    def __init__(self, value):
+        # Precompute the title, as it's used for display (and logging)
+        self._title = value.replace('_', ' ').title()
+
     @property
     def title(self):
-        return self.value.replace('_', ' ').title()
+        return self._title
 
 
 class TurnaroundBase(Enum):
@@ -97,9 +115,13 @@ class TurnaroundBase(Enum):
         obj.price_rate = price_rate_increment
         return obj
 
+    def __init__(self, *args):
+        # The member name is already set at this point
+        self._title = self._name_.replace('_', ' ').title()
+
     @property
     def title(self):
-        return self._name_.replace('_', ' ').title()
+        return self._title
 
     def __repr__(self):
         return (f'<{self.__class__.__name__}.{self._name_}: '
@@ -108,13 +130,37 @@ class TurnaroundBase(Enum):
     def __str__(self):
         return self.__repr__()
 
+    @classmethod
+    def lookup(cls, name: str):
+        """
+        Return the turnaround level for a (case-insensitive) name, such as
+        'Two hour' or 'TWO_HOUR', or None if there is no such level.
+        """
+        # Map each normalized turnaround name (ex. 'TWO_HOUR') to its member,
+        # built on first use for each subclass.
+        lookup = cls.__dict__.get('_LOOKUP')
+        if lookup is None:
+            lookup = cls._LOOKUP = dict(cls.__members__)
+
+        return lookup.get(name.upper().replace(' ', '_'))
+
     @classmethod
     def sort_by_hours(cls, reverse=False):
-        return sorted(cls.__members__.values(), key=lambda e: e.hours, reverse=reverse)
+        return list(cls._sorted_by('hours', reverse))
 
     @classmethod
     def sort_by_price(cls, reverse=False):
-        return sorted(cls.__members__.values(), key=lambda e: e.price_rate, reverse=reverse)
+        return list(cls._sorted_by('price_rate', reverse))
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _sorted_by(cls, attr: str, reverse: bool):
+        """
+        Return the members sorted by an attribute; this is cached, since the
+        members never change.
+        """
+        return tuple(sorted(cls.__members__.values(),
+                            key=attrgetter(attr), reverse=reverse))
 
 
 class Turnaround(TurnaroundBase):
@@ -138,8 +184,44 @@ class TurnaroundAD(TurnaroundBase):
     RUSH = 9, 24, 4.00
 
 
+# Map each value to its Enum member, as a dict lookup is a lot cheaper than
+# calling the Enum class for each object that we create below.
+_LANGUAGE_BY_ID = Language._value2member_map_
+_STATUS_BY_VALUE = TranscriptStatus._value2member_map_
+
+# Map each transcript type in the API to its display name
+_TRANSCRIPT_TYPES = {'TranslatedTranscript': 'Translation',
+                     'TranscribedTranscript': 'Transcript',
+                     'ReviewedTranscript': 'Transcript (Reviewed)',
+                     'ImportedTranscript': 'Transcript (Imported)',
+                     'VendorTranscribedTranscript': 'Transcript (Vendor)',
+                     'AsrTranscript': 'ASR'}
+
+# Parse the timestamps from API responses; these are cached, since the same
+# timestamps tend to repeat across the transcripts for a media file.
+_parse_datetime = lru_cache(maxsize=4096)(datetime.fromisoformat)
+
+
+def _language(lang_id) -> Language:
+    try:
+        return _LANGUAGE_BY_ID[lang_id]
+    except (KeyError, TypeError):
+        # Let the Enum class handle (or raise an error for) the value
+        return Language(lang_id)
+
+
+def _status(status: str) -> TranscriptStatus:
+    try:
+        return _STATUS_BY_VALUE[status]
+    except (KeyError, TypeError):
+        return TranscriptStatus(status)
+
+
 @dataclass(init=False)
 class MediaFile:
+    __slots__ = ('id', 'name', 'duration', 'language', 'source', 'video_id',
+                 'created_at', 'updated_at')
+
     id: int
     name: str
     duration: int
@@ -153,11 +235,11 @@ class MediaFile:
         self.id = kwargs['id']
         self.name = kwargs['name']
         self.duration = kwargs['duration']
-        self.language = Language(kwargs['language_id'])
+        self.language = _language(kwargs['language_id'])
         self.source = kwargs['source']
         self.video_id = kwargs['reference_id']
-        self.created_at = datetime.fromisoformat(kwargs['created_at'])
-        self.updated_at = datetime.fromisoformat(kwargs['updated_at'])
+        self.created_at = _parse_datetime(kwargs['created_at'])
+        self.updated_at = _parse_datetime(kwargs['updated_at'])
 
     @staticmethod
     def url(file_id: int) -> str:
@@ -166,6 +248,10 @@ class MediaFile:
 
 @dataclass(init=False)
 class Transcript:
+    __slots__ = ('id', 'media_file_id', 'video_id', 'duration', 'default',
+                 'type', 'language', 'status', 'cancellable',
+                 'created_at', 'completed_at')
+
     id: str
     media_file_id: int
     video_id: str
@@ -176,27 +262,38 @@ class Transcript:
     status: TranscriptStatus
     cancellable: bool
 
-    created_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    created_at: Optional[datetime]
+    completed_at: Optional[datetime]
 
-    transcript_types = {'TranslatedTranscript': 'Translation',
-                        'TranscribedTranscript': 'Transcript',
-                        'ReviewedTranscript': 'Transcript (Reviewed)',
-                        'ImportedTranscript': 'Transcript (Imported)',
-                        'VendorTranscribedTranscript': 'Transcript (Vendor)',
-                        'AsrTranscript': 'ASR'}
+    # Kept for backwards compatibility; see `_TRANSCRIPT_TYPES` instead
+    transcript_types = _TRANSCRIPT_TYPES
 
     def __init__(self, media_file: MediaFile = None, **kwargs):
-        self.id = str(kwargs['id'])
-        self.media_file_id = kwargs['media_file_id']
-        self.video_id = kwargs['reference_id']
-        self.duration = kwargs['duration'] or 0
-        self.default = kwargs['default']
-        self.type = self.transcript_types.get(
-            kwargs['type'], kwargs['type'])
-        self.language = Language(kwargs['language_id'])
-        self.status = TranscriptStatus(kwargs['status'])
-        self.cancellable = kwargs['cancellable']
+        self._load(kwargs, media_file)
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any],
+                 media_file: MediaFile = None) -> 'Transcript':
+        """
+        Create a :class:`Transcript` from a row of transcript data returned by
+        the 3Play API; this avoids unpacking (and copying) the row as keyword
+        arguments, as in ``Transcript(**row)``.
+        """
+        obj = cls.__new__(cls)
+        obj._load(row, media_file)
+        return obj
+
+    def _load(self, row: Dict[str, Any], media_file: Optional[MediaFile]):
+        self.id = str(row['id'])
+        self.media_file_id = row['media_file_id']
+        self.video_id = row['reference_id']
+        self.duration = row['duration'] or 0
+        self.default = row['default']
+        self.type = _TRANSCRIPT_TYPES.get(row['type'], row['type'])
+        self.language = _language(row['language_id'])
+        self.status = _status(row['status'])
+        self.cancellable = row['cancellable']
+        self.created_at = self.completed_at = None
 
         if media_file:
             self.created_at = media_file.created_at
@@ -206,16 +303,19 @@ class Transcript:
 
 @dataclass(init=False)
 class AudioDescription:
+    __slots__ = ('id', 'media_file_id', 'video_id', 'duration', 'language',
+                 'status', 'created_at', 'completed_at', 'type')
+
     id: str
     media_file_id: int
     video_id: str
     duration: int
     language: Language
     status: TranscriptStatus
-    created_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    created_at: Optional[datetime]
+    completed_at: Optional[datetime]
 
-    type: str = 'Audio Description'
+    type: str
 
     def __init__(self, media_file: MediaFile = None, **kwargs):
         # Use a different id for the audio descriptions, since we don't know
@@ -226,7 +326,9 @@ class AudioDescription:
         self.video_id = kwargs['reference_id']
         self.duration = kwargs['duration']
         self.language = Language.ENGLISH
-        self.status = TranscriptStatus(kwargs['status'])
+        self.status = _status(kwargs['status'])
+        self.created_at = self.completed_at = None
+        self.type = 'Audio Description'
 
         if media_file:
             self.language = media_file.language